@@ -28,4 +28,11 @@ FONT_SIZE_SMALL = 24
 # Game settings
 PLAYER_BLACK = 1
 PLAYER_WHITE = 2
-FPS = 60
\ No newline at end of file
+FPS = 60
+
+# Replay settings
+REPLAY_SPEED = 4.0  # moves per second
+REPLAY_SPEED_MIN = 0.25
+REPLAY_SPEED_MAX = 1024.0
+REPLAY_CACHE_SIZE = 32  # cached board frames
+REPLAY_SEEK_STEP = 10
\ No newline at end of file
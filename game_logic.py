@@ -3,6 +3,7 @@ import random
 import numpy as np
 import numpy.typing as npt
 import threading
+from pathlib import Path
 
 
 _thread_local = threading.local()
@@ -117,3 +118,17 @@ def get_winner(board: npt.NDArray[np.int8], n: int) -> int:
         if has_player_won(board, n, player):
             return player
     return -1 if is_board_full(board) else 0
+
+
+def collect_game_paths(paths: list[str]) -> list[Path]:
+    """
+    Expand directories to the exported games they contain (game_0.npy, game_1.npy, ...), files are kept as given.
+    """
+
+    games = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            games.extend(sorted(path.glob("game_*.npy"), key=lambda p: (len(p.name), p.name)))
+        else:
+            games.append(path)
+    return games
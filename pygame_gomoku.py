@@ -3,6 +3,7 @@ import sys
 import numpy as np
 import argparse 
 import pygame.gfxdraw
+from collections import OrderedDict
 from pathlib import Path
 from game_logic import (
     create_board,
@@ -11,7 +12,8 @@ from game_logic import (
     position_is_empty,
     generate_next_move_random,
     get_winner,
-    is_board_full
+    is_board_full,
+    collect_game_paths
 )
 from config import *
 
@@ -58,21 +60,23 @@ class GomokuGame:
         y = self.margin + row * self.cell_size
         return x, y
     
-    def draw_board(self):
+    def draw_board(self, surface=None):
+        if surface is None:
+            surface = self.screen
 
-        self.screen.fill(BOARD_COLOR)
+        surface.fill(BOARD_COLOR)
         
         # grid 
         for i in range(self.board_size):
             # vertical 
             x = self.margin + i * self.cell_size
-            pygame.draw.line(self.screen, LINE_COLOR, 
+            pygame.draw.line(surface, LINE_COLOR, 
                            (x, self.margin), 
                            (x, self.margin + (self.board_size - 1) * self.cell_size), 2)
             
             # horizontal
             y = self.margin + i * self.cell_size
-            pygame.draw.line(self.screen, LINE_COLOR, 
+            pygame.draw.line(surface, LINE_COLOR, 
                            (self.margin, y), 
                            (self.margin + (self.board_size - 1) * self.cell_size, y), 2)
         
@@ -81,27 +85,29 @@ class GomokuGame:
             star_points = [(3, 3), (3, 11), (11, 3), (11, 11), (7, 7)]
             for row, col in star_points:
                 px, py = self.get_pixelcoords(row, col)
-                pygame.draw.circle(self.screen, LINE_COLOR, (px, py), 4)
+                pygame.draw.circle(surface, LINE_COLOR, (px, py), 4)
     
-    def draw_stone(self, row, col, player, highlight=False):
+    def draw_stone(self, row, col, player, highlight=False, surface=None):
         """stone at the given board position"""
+        if surface is None:
+            surface = self.screen
         x, y = self.get_pixelcoords(row, col)
         radius = self.cell_size // 2 - 2
         
         color = BLACK if player == PLAYER_BLACK else WHITE
         
         # anti-aliasing for smoother stones
-        pygame.gfxdraw.aacircle(self.screen, x, y, radius, color)
-        pygame.gfxdraw.filled_circle(self.screen, x, y, radius, color)
+        pygame.gfxdraw.aacircle(surface, x, y, radius, color)
+        pygame.gfxdraw.filled_circle(surface, x, y, radius, color)
         
         # outline for white stones
         if player == PLAYER_WHITE:
-            pygame.gfxdraw.aacircle(self.screen, x, y, radius, LINE_COLOR)
+            pygame.gfxdraw.aacircle(surface, x, y, radius, LINE_COLOR)
         
         # highlight > last move
         if highlight:
-            pygame.gfxdraw.aacircle(self.screen, x, y, radius + 2, HIGHLIGHT_COLOR)
-            pygame.gfxdraw.aacircle(self.screen, x, y, radius + 3, HIGHLIGHT_COLOR)
+            pygame.gfxdraw.aacircle(surface, x, y, radius + 2, HIGHLIGHT_COLOR)
+            pygame.gfxdraw.aacircle(surface, x, y, radius + 3, HIGHLIGHT_COLOR)
     
     def draw_hover(self, row, col):
         """hover indicator at valid positions"""
@@ -287,6 +293,222 @@ class GomokuGame:
         sys.exit()
 
 
+class ReplayViewer(GomokuGame):
+    """viewer for exported games > memory-mapped, frames rebuilt from move deltas"""
+
+    def __init__(self, paths):
+        self.paths = paths
+        self.message = None  # skipped files > shown in the info bar
+        loaded = self.find_game(0, 1)
+        if loaded is None:
+            raise ValueError("no loadable games to replay")
+        self.game_index, states, moves = loaded
+        super().__init__(board_size=states.shape[1], bot_mode="none", two_player=True)
+
+        self.frames = OrderedDict()  # move count -> board surface, LRU order
+        self.playing = False
+        self.speed = REPLAY_SPEED
+        self.pending = 0.0
+        self.set_game(states, moves)
+
+    @staticmethod
+    def open_game(path):
+        """memory-map a stored game > the states are not copied into memory"""
+        states = np.load(path, mmap_mode="r")
+        if states.ndim != 3 or states.shape[1] != states.shape[2] or len(states) == 0:
+            raise ValueError(f"expected shape (num_moves, size, size), got {states.shape}")
+        return states
+
+    @staticmethod
+    def extract_moves(states):
+        """(row, col, player) per move > diff of consecutive states, reads the whole game once"""
+        empty = np.zeros((1,) + states.shape[1:], dtype=states.dtype)
+        changed = states != np.concatenate((empty, states[:-1]))
+        steps, rows, cols = np.nonzero(changed)
+        if not np.array_equal(steps, np.arange(len(states))):
+            raise ValueError("expected exactly one new stone per move")
+        players = np.asarray(states[steps, rows, cols])
+        return list(zip(rows.tolist(), cols.tolist(), players.tolist()))
+
+    def find_game(self, index, step):
+        """first loadable game from index on in the given direction > broken files are skipped"""
+        skipped = []
+        for i in range(len(self.paths)):
+            current = (index + i * step) % len(self.paths)
+            path = self.paths[current]
+            try:
+                states = self.open_game(path)
+                moves = self.extract_moves(states)
+            except (ValueError, OSError, EOFError) as e:
+                print(f"Skipping {path}: {e}")
+                skipped.append(Path(path).name)
+                continue
+            self.message = f"Übersprungen: {', '.join(skipped)}" if skipped else None
+            return current, states, moves
+        return None
+
+    def set_game(self, states, moves):
+        """switch to another game > resize window if the board size changed"""
+        if states.shape[1] != self.board_size:
+            self.board_size = states.shape[1]
+            self.window_size = self.board_size * self.cell_size + 2 * self.margin
+            self.screen = pygame.display.set_mode((self.window_size, self.window_size + INFO_HEIGHT))
+
+        self.states = states
+        self.moves = moves
+        self.frames.clear()
+        self.playing = False
+        self.pending = 0.0
+
+        winner = get_winner(np.asarray(states[-1]), WIN_CONDITION)
+        self.winner = winner if winner in (PLAYER_BLACK, PLAYER_WHITE) else None
+
+        # start on the final position > outcome first, then step through
+        self.position = len(self.moves)
+        name = Path(self.paths[self.game_index]).name
+        pygame.display.set_caption(f"Gomoku Replay - {name} ({self.game_index + 1}/{len(self.paths)})")
+
+    def switch_game(self, step):
+        # the current game is loadable, so the search always finds one
+        self.game_index, states, moves = self.find_game(self.game_index + step, step)
+        self.set_game(states, moves)
+
+    def seek(self, position):
+        self.position = min(max(position, 0), len(self.moves))
+
+    def get_frame(self, position):
+        """board surface after `position` moves > built from the nearest cached frame before it"""
+        frame = self.frames.get(position)
+        if frame is not None:
+            self.frames.move_to_end(position)
+            return frame
+
+        base = max((i for i in self.frames if i < position), default=None)
+        if base is None:
+            base = 0
+            frame = pygame.Surface((self.window_size, self.window_size)).convert()
+            self.draw_board(frame)
+        else:
+            self.frames.move_to_end(base)
+            frame = self.frames[base].copy()
+
+        # only the stones placed since the base frame need drawing
+        for row, col, player in self.moves[base:position]:
+            self.draw_stone(row, col, player, surface=frame)
+
+        self.frames[position] = frame
+        if len(self.frames) > REPLAY_CACHE_SIZE:
+            self.frames.popitem(last=False)
+        return frame
+
+    def draw_position(self):
+        self.screen.blit(self.get_frame(self.position), (0, 0))
+
+        # highlight > last move, drawn on top so cached frames stay reusable
+        if self.position > 0:
+            row, col, player = self.moves[self.position - 1]
+            self.draw_stone(row, col, player, highlight=True)
+
+    def draw_info(self):
+        info_rect = pygame.Rect(0, self.window_size, self.window_size, INFO_HEIGHT)
+        pygame.draw.rect(self.screen, INFO_COLOR, info_rect)
+
+        # progress bar > click to seek
+        total = len(self.moves)
+        progress = int(self.window_size * self.position / total)
+        pygame.draw.rect(self.screen, HIGHLIGHT_COLOR, (0, self.window_size, progress, 4))
+
+        text = f"Zug {self.position}/{total}"
+        if self.position == total:
+            if self.winner:
+                text += f" - Spieler {'Schwarz' if self.winner == PLAYER_BLACK else 'Weiß'} gewinnt!"
+            else:
+                text += " - Unentschieden!"
+
+        text_surface = FONT.render(text, True, WHITE)
+        text_rect = text_surface.get_rect(center=(self.window_size // 2, self.window_size + INFO_HEIGHT // 2 - 6))
+        self.screen.blit(text_surface, text_rect)
+
+        status = f"{'Wiedergabe' if self.playing else 'Pause'} - {self.speed:g} Züge/s"
+        if self.message:
+            status += f" - {self.message}"
+        status_text = FONT_SMALL.render(status, True, WHITE)
+        status_rect = status_text.get_rect(center=(self.window_size // 2, self.window_size + INFO_HEIGHT - 12))
+        self.screen.blit(status_text, status_rect)
+
+    def process_key(self, key):
+        """replay controls > returns False to quit"""
+        if key == pygame.K_ESCAPE:
+            return False
+        elif key == pygame.K_SPACE:
+            if not self.playing and self.position == len(self.moves):
+                self.seek(0)
+            self.playing = not self.playing
+            self.pending = 0.0
+        elif key == pygame.K_UP:
+            self.speed = min(self.speed * 2, REPLAY_SPEED_MAX)
+        elif key == pygame.K_DOWN:
+            self.speed = max(self.speed / 2, REPLAY_SPEED_MIN)
+        elif key == pygame.K_n:
+            self.switch_game(1)
+        elif key == pygame.K_p:
+            self.switch_game(-1)
+        else:
+            # manual seeking pauses autoplay
+            steps = {
+                pygame.K_RIGHT: 1,
+                pygame.K_LEFT: -1,
+                pygame.K_PAGEDOWN: REPLAY_SEEK_STEP,
+                pygame.K_PAGEUP: -REPLAY_SEEK_STEP,
+            }
+            if key in steps:
+                self.seek(self.position + steps[key])
+                self.playing = False
+            elif key == pygame.K_HOME:
+                self.seek(0)
+                self.playing = False
+            elif key == pygame.K_END:
+                self.seek(len(self.moves))
+                self.playing = False
+        return True
+
+    def run(self):
+        running = True
+
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    running = self.process_key(event.key)
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    x, y = event.pos
+                    if y >= self.window_size:
+                        self.seek(round(len(self.moves) * x / self.window_size))
+                        self.playing = False
+                elif event.type == pygame.MOUSEWHEEL:
+                    self.seek(self.position - event.y)
+                    self.playing = False
+
+            self.draw_position()
+            self.draw_info()
+
+            pygame.display.flip()
+            dt = self.clock.tick(FPS) / 1000
+
+            # autoplay > may advance several moves per frame at high speeds
+            if self.playing:
+                self.pending += dt * self.speed
+                steps = int(self.pending)
+                self.pending -= steps
+                self.seek(self.position + steps)
+                if self.position == len(self.moves):
+                    self.playing = False
+
+        pygame.quit()
+        sys.exit()
+
+
 def parse_args():
     """cli"""
     parser = argparse.ArgumentParser(description="configurable settings")
@@ -303,12 +525,30 @@ def parse_args():
         default="random",
         help="Bot mode: random, ai > not implemented / or none for 2-player > default: random"
     )
+    parser.add_argument(
+        "--replay",
+        nargs="+",
+        metavar="PATH",
+        help="Replay exported games (.npy files or directories) instead of playing"
+    )
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
     
+    if args.replay:
+        paths = collect_game_paths(args.replay)
+        if not paths:
+            print("ERROR!!! no games found to replay")
+            sys.exit(1)
+        try:
+            viewer = ReplayViewer(paths)
+        except ValueError as e:
+            print(f"ERROR!!! {e}")
+            sys.exit(1)
+        viewer.run()
+    
     # check if ai mode is selected
     if args.bot == "ai":
         print("ERROR!!! AI > not implemented")